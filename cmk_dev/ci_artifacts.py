@@ -14,21 +14,23 @@ import asyncio
 import json
 import logging
 import os
+import shutil
 import sys
 import time
 from argparse import ArgumentParser
 from argparse import Namespace as Args
-from collections.abc import Mapping, Sequence
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
-from datetime import datetime
-from itertools import chain
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 from subprocess import check_output
 from typing import Any, Literal, cast
 
 from jenkins import Jenkins
 from trickkiste.logging_helper import apply_common_logging_cli_args, setup_logging
-from trickkiste.misc import compact_dict, cwd, md5from, split_params
+from trickkiste.misc import compact_dict, dur_str, split_params
 
 from .jenkins_utils import (
     AugmentedJenkinsClient,
@@ -43,7 +45,7 @@ from .jenkins_utils import (
     extract_credentials,
     params_from,
 )
-from .utils import Fatal
+from .utils import Fatal, cache_dir, cached_md5from, persistent_json
 from .version import __version__
 
 # Todo: warn about missing parameters
@@ -134,6 +136,12 @@ def parse_args() -> Args:
             action="store_true",
             help="If set, existing files not part of artifacts won't be deleted",
         )
+        subparser.add_argument(
+            "--max-parallel-downloads",
+            default=8,
+            type=int,
+            help="Number of artifacts to be downloaded simultaneously (default: 8)",
+        )
 
     parser_request = subparsers.add_parser(
         "request", help="Request a build or identify an existing one."
@@ -229,13 +237,59 @@ def git_commit_id(git_dir: Path, path: None | Path | str = None) -> str:
 
     if path and not (git_dir / path).exists():
         raise Fatal(f"There is no path to '{path}' inside '{git_dir}'")
-    with cwd(git_dir):
-        return check_output(
-            # use the full hash - short hashes cannot be checked out and they are not
-            # unique among machines
-            ["git", "log", "--pretty=tformat:%H", "-n1"] + ([str(path)] if path else []),
-            text=True,
-        ).strip("\n")
+    # don't chdir() into @git_dir, since this function gets called from multiple threads
+    return check_output(
+        # use the full hash - short hashes cannot be checked out and they are not
+        # unique among machines
+        ["git", "log", "--pretty=tformat:%H", "-n1"] + ([str(path)] if path else []),
+        cwd=git_dir,
+        text=True,
+    ).strip("\n")
+
+
+def git_commit_ids(git_dir: Path, paths: Iterable[str]) -> Mapping[str, str]:
+    """Returns the git hashes for each of @paths (relative to @git_dir) - one `git log` is
+    run for each path, but all of them concurrently. Results are cached for the currently
+    checked out commit, so as long as HEAD doesn't change, no `git log` is needed at all."""
+    unique_paths = list(dict.fromkeys(paths))
+    if not unique_paths:
+        return {}
+    if not git_dir.is_dir():
+        raise Fatal(f"Provided path '{git_dir}', considered a git-checkout-dir is not a directory")
+    for path in unique_paths:
+        if not (git_dir / path).exists():
+            raise Fatal(f"There is no path to '{path}' inside '{git_dir}'")
+
+    head, shallow = check_output(
+        ["git", "rev-parse", "HEAD", "--is-shallow-repository"], cwd=git_dir, text=True
+    ).split()
+    # In shallow clones `git log` might find other commits for the same HEAD once the clone
+    # gets deepened, so we don't cache anything for them
+    cacheable = shallow == "false"
+    with persistent_json(cache_dir() / "ci-artifacts" / "git-hashes.json") as git_hashes:
+        # keep only the most recent HEAD for each checkout, and only for existing checkouts
+        for stale_dir in [checkout for checkout in git_hashes if not Path(checkout).is_dir()]:
+            del git_hashes[stale_dir]
+        checkout_key = str(git_dir.absolute())
+        cached = git_hashes.get(checkout_key) or {}
+        commit_ids: dict[str, str] = (
+            dict(cached.get("hashes") or {}) if cacheable and cached.get("head") == head else {}
+        )
+        if missing := [path for path in unique_paths if path not in commit_ids]:
+            log().debug("determine git hashes for %s", ", ".join(missing))
+            with ThreadPoolExecutor(max_workers=min(len(missing), 8)) as executor:
+                commit_ids.update(
+                    zip(
+                        missing,
+                        executor.map(lambda path: git_commit_id(git_dir, path), missing),
+                        strict=True,
+                    )
+                )
+        if cacheable:
+            git_hashes[checkout_key] = {"head": head, "hashes": commit_ids}
+        else:
+            git_hashes.pop(checkout_key, None)
+        return {path: commit_ids[path] for path in unique_paths}
 
 
 def extract_path_hashes(parameters: GenMap) -> PathHashes:
@@ -246,15 +300,95 @@ def extract_path_hashes(parameters: GenMap) -> PathHashes:
     }
 
 
+def download_artifact(client: Jenkins, build: Build, artifact: str, out_dir: Path) -> None:
+    """Downloads a single @artifact of @build to @out_dir"""
+    # pylint: disable=protected-access
+    with client._session.get(f"{build.url}artifact/{artifact}", stream=True) as reply:
+        log().debug("download: %s", artifact)
+        reply.raise_for_status()
+        (artifact_filename := out_dir / artifact).parent.mkdir(parents=True, exist_ok=True)
+        with open(artifact_filename, "wb") as out_file:
+            # let shutil do the copying rather than iterating over chunks in Python
+            reply.raw.decode_content = True
+            shutil.copyfileobj(reply.raw, out_file, length=1 << 20)
+
+
+def artifact_file_stats(out_dir: Path, artifacts: Sequence[str]) -> Mapping[str, None | list[int]]:
+    """Returns modification time and size for each of @artifacts inside @out_dir"""
+    stats: dict[str, None | list[int]] = {}
+    for artifact in artifacts:
+        try:
+            stat = (out_dir / artifact).stat()
+            stats[artifact] = [stat.st_mtime_ns, stat.st_size]
+        except FileNotFoundError:
+            stats[artifact] = None
+    return stats
+
+
 def download_artifacts(
     client: Jenkins,
     build: Build,
     out_dir: Path,
     no_remove_others: bool = False,
+    max_parallel_downloads: int = 8,
 ) -> tuple[Sequence[str], Sequence[str]]:
     """Downloads all artifacts listed for given job/build to @out_dir"""
+    if not build.artifacts:
+        raise Fatal("Job has no artifacts!")
+
+    existing_files = set(
+        p.relative_to(out_dir).as_posix() for p in out_dir.glob("**/*") if p.is_file()
+    )
+
+    downloaded_artifacts: Sequence[str]
+    skipped_artifacts: Sequence[str]
+
+    # Artifacts of a given build don't change, so if @out_dir still contains exactly the files
+    # we left there after syncing the same build the last time, there is nothing to check
+    with persistent_json(cache_dir() / "ci-artifacts" / "synced-dirs.json") as synced_dirs:
+        out_dir_key = str(out_dir.absolute())
+        if synced_dirs.get(out_dir_key) == {
+            "build": build.url,
+            "files": artifact_file_stats(out_dir, build.artifacts),
+        }:
+            log().debug("artifacts of %s are still unchanged in %s", build.url, out_dir)
+            downloaded_artifacts, skipped_artifacts = [], list(build.artifacts)
+        else:
+            downloaded_artifacts, skipped_artifacts = sync_artifacts(
+                client, build, out_dir, max_parallel_downloads
+            )
+            synced_dirs[out_dir_key] = {
+                "build": build.url,
+                "files": artifact_file_stats(out_dir, build.artifacts),
+            }
+        # forget about output directories which don't exist anymore (e.g. removed workspaces)
+        for stale_dir in [key for key in synced_dirs if not Path(key).is_dir()]:
+            del synced_dirs[stale_dir]
+
+    if not no_remove_others:
+        for path in existing_files - set(build.artifacts):
+            log().debug("Remove superfluous file %s", path)
+            with suppress(FileNotFoundError):
+                (out_dir / path).unlink()
+    log().info(
+        "%d artifacts available in '%s' (%d skipped, because they were up to date locally)",
+        len(downloaded_artifacts) + len(skipped_artifacts),
+        out_dir,
+        len(skipped_artifacts),
+    )
+
+    return downloaded_artifacts, skipped_artifacts
+
+
+def sync_artifacts(
+    client: Jenkins,
+    build: Build,
+    out_dir: Path,
+    max_parallel_downloads: int,
+) -> tuple[Sequence[str], Sequence[str]]:
+    """Downloads those artifacts of @build which are not available locally with a matching
+    fingerprint and returns names of downloaded and skipped artifacts"""
     # pylint: disable=protected-access
-    # pylint: disable=too-many-locals
 
     downloaded_artifacts, skipped_artifacts = [], []
 
@@ -266,19 +400,16 @@ def download_artifacts(
     # see: https://stackoverflow.com/questions/45555108
     # Our workaround: replace fingerprint names with those of the artifacts
 
-    fp_url = f"{build.url}api/json?tree=fingerprint[hash]"
-    log().debug("fetch artifact fingerprints from %s", fp_url)
-
-    if not build.artifacts:
-        raise Fatal("Job has no artifacts!")
+    # fingerprints usually come with the build info already
+    if (fingerprints := build.fingerprints) is None:
+        fp_url = f"{build.url}api/json?tree=fingerprint[hash]"
+        log().debug("fetch artifact fingerprints from %s", fp_url)
+        fingerprints = [
+            fprint["hash"] for fprint in client._session.get(fp_url).json()["fingerprint"]
+        ]
 
     # create new fingerprints from artifact names an fingerprint hashes, keeping their order
-    artifact_hashes = dict(
-        zip(
-            sorted(build.artifacts),
-            (fprint["hash"] for fprint in client._session.get(fp_url).json()["fingerprint"]),
-        )
-    )
+    artifact_hashes = dict(zip(sorted(build.artifacts), fingerprints))
 
     if len(artifact_hashes) != len(build.artifacts):
         log().error(
@@ -290,16 +421,30 @@ def download_artifacts(
     if not artifact_hashes:
         raise Fatal(f"no (fingerprinted) artifacts found at {build.url}")
 
-    existing_files = set(
-        p.relative_to(out_dir).as_posix() for p in out_dir.glob("**/*") if p.is_file()
-    )
+    # Re-hashing unchanged local files is what makes repeated runs slow, so we remember
+    # hashes by modification time and size
+    with persistent_json(cache_dir() / "ci-artifacts" / "md5sums.json") as md5_cache:
+        local_hashes = {
+            artifact: cached_md5from(out_dir / artifact, md5_cache) for artifact in build.artifacts
+        }
+        # forget files in @out_dir which aren't artifacts (anymore) and files elsewhere which
+        # don't exist anymore (e.g. removed or moved output directories)
+        out_dir_prefix = f"{out_dir.absolute()}/"
+        for stale_key in [
+            key
+            for key in md5_cache
+            if (
+                key[len(out_dir_prefix) :] not in local_hashes
+                if key.startswith(out_dir_prefix)
+                else not Path(key).exists()
+            )
+        ]:
+            del md5_cache[stale_key]
 
     for artifact in build.artifacts:
-        existing_files -= {artifact}
         fp_hash = artifact_hashes[artifact]
         log().debug("handle artifact: %s (md5: %s)", artifact, fp_hash)
-        artifact_filename = out_dir / artifact
-        local_hash = md5from(artifact_filename)
+        local_hash = local_hashes[artifact]
 
         if local_hash == fp_hash:
             log().debug("file is already available locally: %s (md5: %s)", artifact, fp_hash)
@@ -313,27 +458,17 @@ def download_artifacts(
                 local_hash,
                 fp_hash,
             )
-
-        with client._session.get(f"{build.url}artifact/{artifact}", stream=True) as reply:
-            log().debug("download: %s", artifact)
-            reply.raise_for_status()
-            artifact_filename.parent.mkdir(parents=True, exist_ok=True)
-            with open(artifact_filename, "wb") as out_file:
-                for chunk in reply.iter_content(chunk_size=1 << 16):
-                    out_file.write(chunk)
-            downloaded_artifacts.append(artifact)
-
-    if not no_remove_others:
-        for path in existing_files - set(downloaded_artifacts) - set(skipped_artifacts):
-            log().debug("Remove superfluous file %s", path)
-            with suppress(FileNotFoundError):
-                (out_dir / path).unlink()
-    log().info(
-        "%d artifacts available in '%s' (%d skipped, because they were up to date locally)",
-        len(downloaded_artifacts) + len(skipped_artifacts),
-        out_dir,
-        len(skipped_artifacts),
-    )
+        downloaded_artifacts.append(artifact)
+
+    # downloads are independent of each other and I/O bound, so we let them overlap
+    # (consuming the results re-raises exceptions from within the workers)
+    with ThreadPoolExecutor(max_workers=max(1, max_parallel_downloads)) as executor:
+        list(
+            executor.map(
+                lambda artifact: download_artifact(client, build, artifact, out_dir),
+                downloaded_artifacts,
+            )
+        )
 
     return downloaded_artifacts, skipped_artifacts
 
@@ -349,39 +484,62 @@ def path_hashes_match(actual: PathHashes, required: PathHashes) -> bool:
     True
     >>> path_hashes_match({"a": "abc"}, {"a": "abcde"})
     True
+    >>> path_hashes_match({"a": "abc"}, {"a": "abc", "b": "def"})
+    False
+    >>> path_hashes_match({"a": "abc"}, {"a": "abd"})
+    False
     """
     if not required:
         return True
-    if required and not actual:
+    if not actual:
         return False
-    if required.keys() - actual.keys():
+    if any(key not in actual for key in required):
         return False
-    return all(
-        hash_required.startswith(hash_actual) or hash_actual.startswith(hash_required)
-        for key, hash_required in required.items()
-        for hash_actual in (actual[key],)
-    )
+    for key, hash_required in required.items():
+        hash_actual = actual[key]
+        if not (hash_required.startswith(hash_actual) or hash_actual.startswith(hash_required)):
+            return False
+    return True
 
 
 def find_mismatching_parameters(
     first: GenMap, second: GenMap
 ) -> Sequence[tuple[str, JobParamValue, JobParamValue]]:
-    """Returns list of key and mismatching values in mapping @first which also occur in @second"""
+    """Returns list of key and mismatching values in mapping @first which also occur in @second
+    >>> find_mismatching_parameters({"A": "1", "B": "2", "C": ""}, {"A": "1", "B": "3", "D": "4"})
+    [('B', '2', '3')]
+    """
     # TODO: find solution for unprovided parameters and default/empty values
+    # only keys with a non-empty value in @first can mismatch, so we don't need to look at
+    # keys of @second
     return [
-        (key, cast(JobParamValue, first.get(key, "")), cast(JobParamValue, second.get(key, "")))
-        for key in set(first.keys() | second.keys()) - {"DISABLE_CACHE"}
-        if first.get(key) and first.get(key, "") != second.get(key, "")
+        (key, cast(JobParamValue, value), cast(JobParamValue, second.get(key, "")))
+        for key, value in first.items()
+        if value and key != "DISABLE_CACHE" and value != second.get(key, "")
     ]
 
 
+@lru_cache(maxsize=4)
+def local_day_bounds(day: date) -> tuple[float, float]:
+    """Returns the (local time) epoch timestamps of the beginning of @day and the day after
+    >>> start, end = local_day_bounds(date(2024, 2, 28))
+    >>> datetime.fromtimestamp(start), datetime.fromtimestamp(end)
+    (datetime.datetime(2024, 2, 28, 0, 0), datetime.datetime(2024, 2, 29, 0, 0))
+    """
+    next_day = day + timedelta(days=1)
+    return (
+        datetime(day.year, day.month, day.day).timestamp(),
+        datetime(next_day.year, next_day.month, next_day.day).timestamp(),
+    )
+
+
 def meets_constraints(
     build: Build,
     params: None | JobParams,
     time_constraints: None | str,
     path_hashes: PathHashes,
     *,
-    now: datetime = datetime.now(),
+    now: None | datetime = None,
 ) -> bool:
     """Checks if a set of requirements are met for a given build"""
 
@@ -446,12 +604,14 @@ def meets_constraints(
         pass
 
     elif time_constraints == "today":
-        if datetime.fromtimestamp(build.timestamp).date() != datetime.now().date():
+        today = (now or datetime.now()).date()
+        today_start, today_end = local_day_bounds(today)
+        if not today_start <= build.timestamp < today_end:
             log().debug(
                 "build #%s does not meet time constraints: %s != %s",
                 build.number,
                 datetime.fromtimestamp(build.timestamp).date(),
-                now.date(),
+                today,
             )
             if result:
                 log().warning(
@@ -466,6 +626,18 @@ def meets_constraints(
     return result
 
 
+def poll_intervals(initial: float, maximum: float = 30.0, factor: float = 1.5) -> Iterator[float]:
+    """Yields exponentially growing delays (capped at @maximum) to wait between polls
+    >>> from itertools import islice
+    >>> list(islice(poll_intervals(1.0, 3.0), 5))
+    [1.0, 1.5, 2.25, 3.0, 3.0]
+    """
+    delay = initial
+    while True:
+        yield delay
+        delay = min(delay * factor, maximum)
+
+
 def build_id_from_queue_item(client: Jenkins, queue_id: QueueId) -> BuildId:
     """Waits for queue item with given @queue_id to be scheduled and returns Build instance"""
     queue_item = client.get_queue_item(queue_id)
@@ -476,12 +648,17 @@ def build_id_from_queue_item(client: Jenkins, queue_id: QueueId) -> BuildId:
         queue_item["url"],
     )
 
+    started, delays = time.monotonic(), poll_intervals(0.25)
     while True:
         queue_item = client.get_queue_item(queue_id)
         if executable := queue_item.get("executable"):
             return executable["number"]
-        log().debug("still waiting in queue, because %s", queue_item["why"])
-        time.sleep(1)
+        log().debug(
+            "still waiting in queue after %s, because %s",
+            dur_str(time.monotonic() - started),
+            queue_item["why"],
+        )
+        time.sleep(next(delays))
 
 
 async def find_matching_queue_item(
@@ -491,12 +668,13 @@ async def find_matching_queue_item(
     path_hashes: PathHashes,
 ) -> None | BuildId:
     """Looks for a queued build matching job and parameters and returns the QueueId"""
-    for queue_item in await jenkins_client.queue_info():
-        if not cast(str, queue_item.get("_class", "")).startswith("hudson.model.Queue"):
-            continue
-        if cast(str, cast(GenMap, queue_item.get("task", {})).get("url", "")) != job.url:
-            continue
-
+    job_queue_items = [
+        queue_item
+        for queue_item in await jenkins_client.queue_info()
+        if cast(str, cast(GenMap, queue_item.get("task", {})).get("url", "")) == job.url
+        and cast(str, queue_item.get("_class", "")).startswith("hudson.model.Queue")
+    ]
+    for queue_item in job_queue_items:
         queue_item_params = params_from(queue_item, "ParametersAction", "parameters")
         mismatching_parameters = find_mismatching_parameters(
             params or {},
@@ -533,13 +711,16 @@ async def find_matching_queue_item(
 
 def compose_path_hashes(base_dir: Path, dependency_paths: Sequence[str]) -> PathHashes:
     """Returns local git hashes for each element in @dependency_paths"""
-    return {
-        path: git_commit_id(base_dir, path)
-        for composite_paths in (dependency_paths or [])
-        if composite_paths
-        for path in composite_paths.split(",")
-        if path
-    }
+    return git_commit_ids(
+        base_dir,
+        (
+            path
+            for composite_paths in (dependency_paths or [])
+            if composite_paths
+            for path in composite_paths.split(",")
+            if path
+        ),
+    )
 
 
 def compose_out_dir(base_dir: Path, out_dir: Path) -> Path:
@@ -650,24 +831,22 @@ async def _fn_await_and_handle_build(args: Args) -> None:
             path_hashes=None,
             allow_to_cancel=False,
         )
+        downloaded, skipped = (
+            download_artifacts(
+                jenkins_client.client,
+                completed_build,
+                out_dir,
+                args.no_remove_others,
+                args.max_parallel_downloads,
+            )
+            if args.download
+            else ([], [])
+        )
         print(
             json.dumps(
                 {
                     "result": completed_build.result,
-                    "artifacts": (
-                        list(
-                            chain(
-                                *download_artifacts(
-                                    jenkins_client.client,
-                                    completed_build,
-                                    out_dir,
-                                    args.no_remove_others,
-                                )
-                            )
-                        )
-                        if args.download
-                        else None
-                    ),
+                    "artifacts": [*downloaded, *skipped] if args.download else None,
                 }
             )
         )
@@ -717,26 +896,23 @@ async def _fn_fetch(args: Args) -> None:
             check_result=True,
             path_hashes=path_hashes,
         )
-        downloaded_artifacts = (
-            list(
-                chain(
-                    *download_artifacts(
-                        jenkins_client.client,
-                        completed_build,
-                        out_dir,
-                        args.no_remove_others,
-                    )
-                )
+        downloaded, skipped = (
+            download_artifacts(
+                jenkins_client.client,
+                completed_build,
+                out_dir,
+                args.no_remove_others,
+                args.max_parallel_downloads,
             )
             if args.download
-            else []
+            else ([], [])
         )
 
         print(
             json.dumps(
                 {
                     "result": completed_build.result,
-                    "artifacts": downloaded_artifacts,
+                    "artifacts": [*downloaded, *skipped],
                 }
             )
         )
@@ -756,20 +932,28 @@ async def identify_matching_build(
     """
     # pylint: disable=too-many-locals
 
-    # fetch a job's build history first
-    await job.expand(jenkins_client)
+    # evaluate 'now' once for all candidates rather than once per build
+    now = datetime.now()
 
-    # Look for finished builds
-    for build in filter(lambda b: b.completed, job.build_infos.values()):
-        if meets_constraints(build, params, time_constraints, path_hashes):
+    # Walk through the build history (fetched page by page) and stop at the first matching
+    # finished build. Matching unfinished builds are only taken into account if there is no
+    # such finished build.
+    matching_unfinished_build = None
+    async for build in job.iter_build_infos(jenkins_client):
+        if not meets_constraints(build, params, time_constraints, path_hashes, now=now):
+            continue
+        if build.completed:
             log().info("found matching finished build: %s (%s)", build.number, build.url)
             return build
+        matching_unfinished_build = matching_unfinished_build or build
 
-    # Look for still unfinished builds
-    for build in filter(lambda b: not b.completed, job.build_infos.values()):
-        if meets_constraints(build, params, time_constraints, path_hashes):
-            log().info("found matching unfinished build: %s (%s)", build.number, build.url)
-            return build
+    if matching_unfinished_build:
+        log().info(
+            "found matching unfinished build: %s (%s)",
+            matching_unfinished_build.number,
+            matching_unfinished_build.url,
+        )
+        return matching_unfinished_build
 
     if matching_item := await find_matching_queue_item(jenkins_client, job, params, path_hashes):
         return await jenkins_client.build_info(job.path, matching_item)
@@ -833,13 +1017,15 @@ async def await_build(
         log().info("build #%s still in progress (%s)", build_number, current_build_info.url)
         if allow_to_cancel:
             await shared_build_info.put(json.dumps({"path": job_full_path, "number": build_number}))
-        while True:
-            if not current_build_info.completed:
-                log().debug("build %s in progress", build_number)
-                time.sleep(10)
-                current_build_info = await jenkins_client.build_info(job_full_path, build_number)
-                continue
-            break
+        started, delays = time.monotonic(), poll_intervals(2.0)
+        while not current_build_info.completed:
+            log().debug(
+                "build %s in progress for %s",
+                build_number,
+                dur_str(time.monotonic() - started),
+            )
+            await asyncio.sleep(next(delays))
+            current_build_info = await jenkins_client.build_info(job_full_path, build_number)
 
         log().info("build finished with result=%s", current_build_info.result)
 
@@ -7,190 +7,254 @@ This file is part of Checkmk (https://checkmk.com). It is subject to the terms a
 conditions defined in the file COPYING, which is part of this source code package.
 """
 
-import logging
+import os
 import sys
-from argparse import ArgumentParser
+from argparse import ArgumentParser, RawDescriptionHelpFormatter
 from argparse import Namespace as Args
+from functools import cache
 from pathlib import Path
-from typing import Sequence, Union
+from typing import TYPE_CHECKING, Sequence, Union
 
-import cmk_dev.binreplace
-import cmk_dev.check_rpath
-import cmk_dev.cpumon
+from .version import __version__
 
-# import cmk_dev.procmon
-import cmk_dev.pycinfo
+if TYPE_CHECKING:
+    import logging
+
+# Modules implementing sub-commands get imported only when needed in order to keep
+# the startup time low
+# pylint: disable=import-outside-toplevel
 
-from .version import __version__
+
+PYTHON_VERSION = f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}"
+
+HOWTO_TOPICS = {
+    "new-distro": """
+        Please look here for now:
+        https://wiki.lan.tribe29.com/books/how-to/page/how-to-integrate-a-new-linux-distribution-in-9-simple-steps
+        """,
+    "testing": """
+        Please look here for now:
+        https://wiki.lan.tribe29.com/books/how-to/page/how-to-test-checkmk
+        """,
+    "setup-system": """
+        Please look here for now:
+        https://wiki.lan.tribe29.com/books/how-to/page/how-to-install-and-manage-multiple-python-versions
+        """,
+    "werkflow": """
+        - werk fetch
+        - review
+        - test locally
+        - pre-commit
+        - format
+        """,
+    "setup-git": """
+        https://wiki.lan.tribe29.com/books/how-to/page/how-to-work-with-git-worktree
+        """,
+    "docker": """
+        https://wiki.lan.tribe29.com/books/how-to/page/how-to-work-locally-with-our-build-containers
+        """,
+    "Pipfile.lock": """
+        scripts/run-in-docker.sh make --what-if Pipfile Pipfile.lock
+        """,
+}
 
 
 def parse_args(argv: Union[Sequence[str], None] = None) -> Args:
     """Cool git like multi command argument parser"""
-    parser = ArgumentParser(__doc__)
+    parser = ArgumentParser(description=__doc__, formatter_class=RawDescriptionHelpFormatter)
     parser.add_argument("--verbose", "-v", action="store_true")
 
     parser.set_defaults(func=lambda *_: parser.print_usage())
     subparsers = parser.add_subparsers(help="available commands", metavar="CMD")
 
-    parser_help = subparsers.add_parser("help")
-    parser_help.set_defaults(func=lambda *_: parser.print_help())
+    def add_help_parser() -> None:
+        parser_help = subparsers.add_parser("help")
+        parser_help.set_defaults(func=lambda *_: parser.print_help())
 
-    parser_info = subparsers.add_parser("info")
-    parser_info.set_defaults(
-        func=fn_info,
-        help="Prints information about checkmk-dev-tools",
-    )
+    def add_info_parser() -> None:
+        parser_info = subparsers.add_parser("info")
+        parser_info.set_defaults(
+            func=fn_info,
+            help="Prints information about checkmk-dev-tools",
+        )
 
-    parser_howto = subparsers.add_parser("howto")
-    parser_howto.set_defaults(func=fn_howto)
-    parser_howto.add_argument(
-        "topic", nargs="?", type=str, help="Provides HowTos to specific topics"
-    )
+    def add_howto_parser() -> None:
+        parser_howto = subparsers.add_parser("howto")
+        parser_howto.set_defaults(func=fn_howto)
+        parser_howto.add_argument(
+            "topic", nargs="?", type=str, help="Provides HowTos to specific topics"
+        )
 
-    parser_dia = subparsers.add_parser("image-alias", aliases=["dia"])
-    parser_dia.set_defaults(
-        func=fn_dia,
-        help="Operate on docker image aliases (DIA)",
-    )
+    def add_dia_parser() -> None:
+        parser_dia = subparsers.add_parser("image-alias", aliases=["dia"])
+        parser_dia.set_defaults(
+            func=fn_dia,
+            help="Operate on docker image aliases (DIA)",
+        )
 
-    parser_rpath = subparsers.add_parser("check-rpath", aliases=["rpath"])
-    parser_rpath.set_defaults(
-        func=fn_rpath,
-        help="Checks and sets RPATH information of ELF specified binaries",
-    )
-    parser_rpath.add_argument(
-        "path", nargs="?", type=Path, help="File or directory to check (recursively)"
-    )
+    def add_rpath_parser() -> None:
+        parser_rpath = subparsers.add_parser("check-rpath", aliases=["rpath"])
+        parser_rpath.set_defaults(
+            func=fn_rpath,
+            help="Checks and sets RPATH information of ELF specified binaries",
+        )
+        parser_rpath.add_argument(
+            "path", nargs="?", type=Path, help="File or directory to check (recursively)"
+        )
 
-    parser_pycinfo = subparsers.add_parser("pycinfo")
-    parser_pycinfo.set_defaults(
-        func=fn_pycinfo,
-        help="Shows content of pyc files",
-    )
-    parser_pycinfo.add_argument(
-        "paths", nargs="*", type=Path, help="File(s) or directory(ies) to check (recursively)"
-    )
+    def add_pycinfo_parser() -> None:
+        parser_pycinfo = subparsers.add_parser("pycinfo")
+        parser_pycinfo.set_defaults(
+            func=fn_pycinfo,
+            help="Shows content of pyc files",
+        )
+        parser_pycinfo.add_argument(
+            "paths", nargs="*", type=Path, help="File(s) or directory(ies) to check (recursively)"
+        )
 
-    # parser_procmon = subparsers.add_parser("procmon")
-    # parser_procmon.set_defaults(
-    #     func=fn_procmon,
-    #     help="Shows content of pyc files",
-    # )
+    # def add_procmon_parser() -> None:
+    #     parser_procmon = subparsers.add_parser("procmon")
+    #     parser_procmon.set_defaults(
+    #         func=fn_procmon,
+    #         help="Shows content of pyc files",
+    #     )
+
+    def add_cpumon_parser() -> None:
+        parser_cpumon = subparsers.add_parser("cpumon")
+        parser_cpumon.set_defaults(
+            func=fn_cpumon,
+            help="Shows content of pyc files",
+        )
+        parser_cpumon.add_argument(
+            "cpus", type=str, help="Comma separated list of CPUs to monitor", nargs="?"
+        )
 
-    parser_cpumon = subparsers.add_parser("cpumon")
-    parser_cpumon.set_defaults(
-        func=fn_cpumon,
-        help="Shows content of pyc files",
-    )
-    parser_cpumon.add_argument(
-        "cpus", type=str, help="Comma separated list of CPUs to monitor", nargs="?"
-    )
+    def add_laccess_parser() -> None:
+        parser_laccess = subparsers.add_parser("last-access")
+        parser_laccess.set_defaults(
+            func=fn_laccess,
+            help="Shows content of pyc files",
+        )
 
-    parser_laccess = subparsers.add_parser("last-access")
-    parser_laccess.set_defaults(
-        func=fn_laccess,
-        help="Shows content of pyc files",
-    )
+    def add_npicked_parser() -> None:
+        parser_npicked = subparsers.add_parser("not-picked")
+        parser_npicked.set_defaults(
+            func=fn_npicked,
+            help="Shows content of pyc files",
+        )
 
-    parser_npicked = subparsers.add_parser("not-picked")
-    parser_npicked.set_defaults(
-        func=fn_npicked,
-        help="Shows content of pyc files",
-    )
+    def add_decent_output_parser() -> None:
+        parser_decent_output = subparsers.add_parser("decent-output")
+        parser_decent_output.set_defaults(
+            func=fn_decent_output,
+            help="Shows output of provided command only if needed",
+        )
 
-    parser_decent_output = subparsers.add_parser("decent-output")
-    parser_decent_output.set_defaults(
-        func=fn_decent_output,
-        help="Shows output of provided command only if needed",
-    )
+    def add_binreplace_parser() -> None:
+        parser_binreplace = subparsers.add_parser("binreplace")
+        parser_binreplace.set_defaults(
+            func=fn_binreplace,
+            help="Replaces strings in files binary-awarely",
+        )
+        import cmk_dev.binreplace
+
+        cmk_dev.binreplace.apply_cli_arguments(parser_binreplace)
+
+    subcommands = {
+        "help": add_help_parser,
+        "info": add_info_parser,
+        "howto": add_howto_parser,
+        "image-alias": add_dia_parser,
+        "dia": add_dia_parser,
+        "check-rpath": add_rpath_parser,
+        "rpath": add_rpath_parser,
+        "pycinfo": add_pycinfo_parser,
+        "cpumon": add_cpumon_parser,
+        "last-access": add_laccess_parser,
+        "not-picked": add_npicked_parser,
+        "decent-output": add_decent_output_parser,
+        "binreplace": add_binreplace_parser,
+    }
 
-    parser_binreplace = subparsers.add_parser("binreplace")
-    parser_binreplace.set_defaults(
-        func=fn_binreplace,
-        help="Replaces strings in files binary-awarely",
+    # Only set up the sub-parser for the command actually given (there are no top-level
+    # options taking a value, so the first non-option argument is the command). All of them
+    # are needed for `help` and for unknown or missing commands.
+    command = next(
+        (arg for arg in (sys.argv[1:] if argv is None else argv) if not arg.startswith("-")),
+        None,
     )
-    cmk_dev.binreplace.apply_cli_arguments(parser_binreplace)
+    if command in subcommands and command != "help":
+        subcommands[command]()
+    else:
+        for add_parser in dict.fromkeys(subcommands.values()):
+            add_parser()
 
     subparsers.help = f"[{' '.join(str(c) for c in subparsers.choices)}]"
 
     return parser.parse_args(argv)
 
 
-def logger() -> logging.Logger:
+def logger() -> "logging.Logger":
     """Named logger"""
+    import logging
+
     return logging.getLogger("trickkiste.cmk-dev")
 
 
-def shorten_home(path: Union[Path, str]) -> Path:
+@cache
+def home_dir() -> str:
+    """Returns (and remembers) the current user's home directory"""
+    return str(Path.home())
+
+
+def shorten_home(path: Union[Path, str]) -> str:
     """Reverse of expanduser"""
-    return Path(Path(path).as_posix().replace(str(Path.home()), "~"))
+    return os.fspath(path).replace(home_dir(), "~")
 
 
 def fn_info(_args: Args) -> None:
     """Entry point `info`"""
     print(f"Version: {__version__} (at {shorten_home(Path(__file__).parent)})")
     print(
-        f"Python: {'.'.join(map(str, sys.version_info[:3]))}"
+        f"Python: {PYTHON_VERSION}"
         f" (at {shorten_home(sys.executable)})"
     )
 
 
 def fn_howto(args: Args) -> None:
     """Entry function for howto"""
-    topics = {
-        "new-distro": """
-        Please look here for now:
-        https://wiki.lan.tribe29.com/books/how-to/page/how-to-integrate-a-new-linux-distribution-in-9-simple-steps
-        """,
-        "testing": """
-        Please look here for now:
-        https://wiki.lan.tribe29.com/books/how-to/page/how-to-test-checkmk
-        """,
-        "setup-system": """
-        Please look here for now:
-        https://wiki.lan.tribe29.com/books/how-to/page/how-to-install-and-manage-multiple-python-versions
-        """,
-        "werkflow": """
-        - werk fetch
-        - review
-        - test locally
-        - pre-commit
-        - format
-        """,
-        "setup-git": """
-        https://wiki.lan.tribe29.com/books/how-to/page/how-to-work-with-git-worktree
-        """,
-        "docker": """
-        https://wiki.lan.tribe29.com/books/how-to/page/how-to-work-locally-with-our-build-containers
-        """,
-        "Pipfile.lock": """
-        scripts/run-in-docker.sh make --what-if Pipfile Pipfile.lock
-        """,
-    }
     print(
-        topics.get(
-            args.topic, f"Please choose one of the available topics: {', '.join(topics.keys())}"
+        HOWTO_TOPICS.get(
+            args.topic, f"Please choose one of the available topics: {', '.join(HOWTO_TOPICS)}"
         )
     )
 
 
 def fn_rpath(args: Args) -> None:
     """Entry function for check-rpath"""
+    import cmk_dev.check_rpath
+
     cmk_dev.check_rpath.check_rpath(args.path)
 
 
 def fn_pycinfo(args: Args) -> None:
     """Entry function for pycinfo"""
+    import cmk_dev.pycinfo
+
     cmk_dev.pycinfo.pycinfo(args.paths)
 
 
 def fn_cpumon(args: Args) -> None:
     """Entry function for cpumon"""
+    import cmk_dev.cpumon
+
     cmk_dev.cpumon.cpumon(args.cpus)
 
 
 def fn_binreplace(args: Args) -> None:
     """Entry function for cpumon"""
+    import cmk_dev.binreplace
+
     cmk_dev.binreplace.main(args)
 
 
@@ -8,27 +8,51 @@ conditions defined in the file COPYING, which is part of this source code packag
 """
 
 import sys
+from collections.abc import Callable, Mapping
+from subprocess import DEVNULL, PIPE, CalledProcessError, Popen
 
-from trickkiste.misc import compact_dict, process_output
+from trickkiste.misc import compact_dict
 
-from cmk_dev.utils import value_from
+# types of (non-string) columns we request from `ps`
+COLUMN_TYPES: Mapping[str, Callable[[str], str | float | int]] = {
+    "PID": int,
+    "%CPU": float,
+    "PSR": int,
+    "SZ": int,
+    "RSS": int,
+}
 
 
 def cpumon(cpus: str) -> None:
     """Basically runs `ps` and shows results for given CPUs only (if given, else all)"""
-    header, *lines = (
-        x.split(maxsplit=8)
-        for x in process_output("ps -axo pid,user,pcpu,psr,sz,rss,args --sort=-pcpu").split("\n")
-        if x.strip()
-    )
-
-    for proc_info in sorted(
-        (pinfo for line in lines if (pinfo := dict(zip(header, map(value_from, line))))),
-        key=lambda x: x["%CPU"],
-        reverse=True,
-    ):
-        if not cpus or str(proc_info["PSR"]) in cpus.split(","):
-            print(compact_dict(proc_info, delim="\t", maxlen=50))
+    wanted_cpus = frozenset(cpus.split(",")) if cpus else None
+
+    # read ps output line by line rather than as a whole - processes come sorted by %CPU
+    # already, so they can be printed right away
+    with Popen(
+        ["ps", "-axo", "pid,user,pcpu,psr,sz,rss,args", "--sort=-pcpu"],
+        stdout=PIPE,
+        stderr=DEVNULL,
+        text=True,
+    ) as process:
+        assert process.stdout
+        # column names are used as keys for each row, so let them share the same objects
+        columns = [sys.intern(column) for column in next(process.stdout).split()]
+        converters = [COLUMN_TYPES.get(column, str) for column in columns]
+        for line in process.stdout:
+            if not line.strip():
+                continue
+            # the last column (COMMAND) may contain spaces, so don't split it
+            proc_info = {
+                column: convert(value)
+                for column, convert, value in zip(
+                    columns, converters, line.split(maxsplit=len(columns) - 1)
+                )
+            }
+            if wanted_cpus is None or str(proc_info["PSR"]) in wanted_cpus:
+                print(compact_dict(proc_info, delim="\t", maxlen=50))
+    if process.returncode:
+        raise CalledProcessError(process.returncode, process.args)
 
 
 def main() -> None:
@@ -7,23 +7,30 @@ conditions defined in the file COPYING, which is part of this source code packag
 """
 # pylint: disable=too-few-public-methods
 # pylint: disable=fixme
+# pylint: disable=import-outside-toplevel
 
 import asyncio
+import hashlib
 import json
 import logging
 import os
 from argparse import ArgumentParser
-from collections.abc import AsyncIterable, Iterable, Mapping, Sequence
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Mapping, Sequence
 from configparser import ConfigParser
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Literal, Union, cast
+from typing import TYPE_CHECKING, Any, Literal, Union, cast
+from urllib.parse import quote
 
-import jenkins
-from jenkins import Jenkins
 from pydantic import BaseModel, Json, model_validator
 from trickkiste.misc import asyncify, compact_dict, date_str, dur_str, split_params
 
-from cmk_dev.utils import Fatal
+from cmk_dev.utils import Fatal, cache_dir, dump_json, load_json
+
+if TYPE_CHECKING:
+    # `jenkins` (and `requests` with it) takes ~100ms to import, so we defer importing it
+    # until a client gets created, for modules only using the models defined here
+    from jenkins import Jenkins
 
 GenMapVal = Union[None, bool, str, float, int, "GenMapArray", "GenMap"]
 GenMapArray = Sequence[GenMapVal]
@@ -37,6 +44,21 @@ BuildId = int
 
 JobResult = Literal["FAILURE", "SUCCESS", "ABORTED", "UNSTABLE"]
 
+# Jenkins API `tree` expressions for everything we evaluate of a build, see `Build` and `Change`
+CHANGE_SETS_TREE = "changeSets[items[id,msg,author[fullName],authorEmail,affectedPaths]]"
+BUILD_TREE = (
+    "number,url,timestamp,duration,result,inProgress,artifacts[relativePath],fingerprint[hash],"
+    f"actions[parameters[name,value],properties],nextBuild[number,url],{CHANGE_SETS_TREE}"
+)
+# build infos persisted on disk are only valid for the tree they've been requested with
+BUILD_CACHE_VERSION = hashlib.sha1(BUILD_TREE.encode()).hexdigest()[:8]
+MAX_CACHED_BUILDS_PER_JOB = 100
+# .. and of a job, see `Job` (`jobs` for folders)
+JOB_TREE = (
+    "_class,name,fullName,url,color,inQueue,queueItem[id],builds[number,url,timestamp],"
+    "lastSuccessfulBuild[number,url],lastCompletedBuild[number,url],jobs[name]"
+)
+
 
 def log() -> logging.Logger:
     """Convenience function retrieves 'our' logger"""
@@ -63,7 +85,7 @@ class JobTreeElement(PedanticBaseModel):
     def correct(cls, obj: Json[dict[str, Any]]) -> Json[dict[str, Any]]:
         """Refactor init to match our excpectations"""
         if "_class" in obj:
-            obj["type"] = obj["_class"].rsplit(".", 1)[-1]
+            obj["type"] = obj["_class"].rpartition(".")[2]
             del obj["_class"]
         return obj
 
@@ -94,6 +116,8 @@ class Build(SimpleBuild):
     result: None | JobResult
     path_hashes: Mapping[str, str]
     artifacts: Sequence[str]
+    # MD5 sums of artifacts as provided by Jenkins (None if not part of the build info)
+    fingerprints: None | Sequence[str] = None
     inProgress: bool
     parameters: Mapping[str, str | bool]
     nextBuild: None | SimpleBuild = None
@@ -108,25 +132,30 @@ class Build(SimpleBuild):
         if obj.get("result") not in {None, "FAILURE", "SUCCESS", "ABORTED", "UNSTABLE"}:
             log().error("Build result has unexpected value %s", obj.get("result"))
 
+        actions = actions_by_class(obj)
+        # Beware: @obj must not be modified, since raw build infos get cached
         return {
             **obj,
-            **{
-                "timestamp": obj["timestamp"] // 1000,
-                "duration": obj["duration"] // 1000,
-                "parameters": params_from(obj, "ParametersAction", "parameters"),
-                "path_hashes": cast(
-                    Mapping[str, str],
-                    params_from(obj, "CustomBuildPropertiesAction", "properties").get(
-                        "path_hashes", {}
-                    ),
+            "timestamp": obj["timestamp"] // 1000,
+            "duration": obj["duration"] // 1000,
+            "parameters": params_from(obj, "ParametersAction", "parameters", actions=actions),
+            "path_hashes": cast(
+                Mapping[str, str],
+                params_from(obj, "CustomBuildPropertiesAction", "properties", actions=actions).get(
+                    "path_hashes", {}
                 ),
-                "artifacts": [
-                    cast(Mapping[str, str], a)["relativePath"]
-                    for a in cast(GenMapArray, obj["artifacts"])
-                ],
-                # SCM could be retrieved via 'hudson.plugins.git.util.BuildData'
-                # "executor": (executor_value := obj.get("executor")) and executor_value["_class"],
-            },
+            ),
+            "artifacts": [
+                cast(Mapping[str, str], a)["relativePath"]
+                for a in cast(GenMapArray, obj["artifacts"])
+            ],
+            "fingerprints": (
+                None
+                if (fingerprints := obj.get("fingerprint")) is None
+                else [cast(Mapping[str, str], f)["hash"] for f in fingerprints]
+            ),
+            # SCM could be retrieved via 'hudson.plugins.git.util.BuildData'
+            # "executor": (executor_value := obj.get("executor")) and executor_value["_class"],
         }
 
     def __repr__(self) -> str:
@@ -163,6 +192,8 @@ class Job(SimpleJob):
     path: str
     builds: Sequence[SimpleBuild] = []
     build_infos: Mapping[int, Build] = {}
+    # start timestamps (in seconds) of `builds` - they identify a build beyond its number
+    build_timestamps: Mapping[int, int] = {}
     lastSuccessfulBuild: None | SimpleBuild = None
     lastCompletedBuild: None | SimpleBuild = None
 
@@ -183,11 +214,15 @@ class Job(SimpleJob):
                 obj.get("queueItem"),
                 obj.get("inQueue"),
             )
-        return {
-            **obj,
-            "path": obj.get("fullname") or obj.get("fullName"),
-            "type": obj.get("type") or obj.get("_class") and obj["_class"].rsplit(".", 1)[-1],
+        # raw job infos are not cached, so (unlike for `Build`) we can modify @obj in place
+        obj["path"] = obj.get("fullname") or obj.get("fullName")
+        obj["type"] = obj.get("type") or obj.get("_class") and obj["_class"].rpartition(".")[2]
+        obj["build_timestamps"] = {
+            build["number"]: build["timestamp"] // 1000
+            for build in obj.get("builds") or []
+            if "timestamp" in build
         }
+        return obj
 
     async def expand(
         self,
@@ -196,11 +231,31 @@ class Job(SimpleJob):
     ) -> "Job":
         """Fetches elements which are not part of the simple job instance"""
         self.build_infos = {
-            (build := await jenkins_client.build_info(self.path, b.number)).number: build
-            for b in self.builds[:max_build_infos]
+            build.number: build
+            for build in await jenkins_client.build_infos(self.path, max_build_infos)
         }
         return self
 
+    async def iter_build_infos(
+        self, jenkins_client: "AugmentedJenkinsClient", first_page_size: int = 10
+    ) -> AsyncIterator[Build]:
+        """Yields build infos (most recent first). Only the @first_page_size most recent
+        builds get fetched first, so callers looking for a recent build don't have to wait
+        for the whole history, which is then fetched with one more request if needed.
+        Fetched builds are added to `build_infos`."""
+        build_infos: dict[int, Build] = {}
+        self.build_infos = build_infos
+        for max_builds, offset in ((first_page_size, 0), (None, first_page_size)):
+            page = await jenkins_client.build_infos(self.path, max_builds, offset=offset)
+            for build in page:
+                # builds started in the meantime shift the history, so skip those we know
+                if build.number in build_infos:
+                    continue
+                build_infos[build.number] = build
+                yield build
+            if max_builds is not None and len(page) < max_builds:
+                break
+
 
 class BuildNode(PedanticBaseModel):
     """A build node model"""
@@ -317,18 +372,37 @@ class Change(PedanticBaseModel):
         }
 
 
-def params_from(build_info: GenMap, action_name: str, item_name: str) -> GenMap:
-    """Return job parameters of provided @build_info as dict"""
-    actions = cast(GenMapArray, build_info.get("actions") or [])
-    for action in map(lambda a: cast(GenMap, a), actions):
-        if cast(str, action.get("_class") or "").rsplit(".", 1)[-1] == action_name:
-            if action_name == "ParametersAction":
-                return {
-                    str(p["name"]): p["value"]
-                    for p in map(lambda a: cast(GenMap, a), cast(GenMapArray, action[item_name]))
-                }
-            if action_name == "CustomBuildPropertiesAction":
-                return cast(GenMap, action[item_name])
+def actions_by_class(build_info: GenMap) -> Mapping[str, GenMap]:
+    """Returns the actions of provided @build_info indexed by their (short) class name. In
+    case there are multiple actions of the same class, the first one is taken"""
+    return {
+        cast(str, action.get("_class") or "").rpartition(".")[2]: action
+        for action in map(
+            lambda a: cast(GenMap, a), reversed(cast(GenMapArray, build_info.get("actions") or []))
+        )
+    }
+
+
+def params_from(
+    build_info: GenMap,
+    action_name: str,
+    item_name: str,
+    *,
+    actions: None | Mapping[str, GenMap] = None,
+) -> GenMap:
+    """Return job parameters of provided @build_info as dict. Provide @actions (see
+    actions_by_class()) in order to avoid re-scanning all actions with each call"""
+    if actions is None:
+        actions = actions_by_class(build_info)
+    if (action := actions.get(action_name)) is None:
+        return {}
+    if action_name == "ParametersAction":
+        return {
+            str(p["name"]): p["value"]
+            for p in map(lambda a: cast(GenMap, a), cast(GenMapArray, action[item_name]))
+        }
+    if action_name == "CustomBuildPropertiesAction":
+        return cast(GenMap, action[item_name])
     return {}
 
 
@@ -371,8 +445,20 @@ def extract_credentials(credentials: None | Mapping[str, str] = None) -> Mapping
     log().debug(
         "Credentials haven't been (fully) provided via --credentials, trying JJB config instead"
     )
+    jjb_config_path = Path("~/.config/jenkins_jobs/jenkins_jobs.ini").expanduser()
+    try:
+        mtime_ns = jjb_config_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        mtime_ns = -1
+    return _jjb_credentials(jjb_config_path, mtime_ns)
+
+
+@lru_cache(maxsize=4)
+def _jjb_credentials(jjb_config_path: Path, _mtime_ns: int) -> Mapping[str, str]:
+    """Reads credentials from JJB config at @jjb_config_path - @_mtime_ns is only used as
+    cache key in order to re-read the file after it has been modified"""
     jjb_config = ConfigParser()
-    jjb_config.read(Path("~/.config/jenkins_jobs/jenkins_jobs.ini").expanduser())
+    jjb_config.read(jjb_config_path)
     return {
         "url": jjb_config["jenkins"]["url"],
         "username": jjb_config["jenkins"]["user"],
@@ -380,31 +466,64 @@ def extract_credentials(credentials: None | Mapping[str, str] = None) -> Mapping
     }
 
 
+def _known_build_timestamp(job: str | Job, build_number: int) -> None | int:
+    """Returns the start timestamp of build @build_number if provided with @job"""
+    return job.build_timestamps.get(build_number) if isinstance(job, Job) else None
+
+
+def _no_mutual_auth_error(record: logging.LogRecord) -> bool:
+    """Logging filter dropping the bogus 'Mutual authentication unavailable' error"""
+    return "Mutual authentication unavailable" not in record.getMessage()
+
+
+def _job_url_path(job_full_name: str) -> str:
+    """Returns the URL path of a job relative to the server, e.g. 'job/folder/job/name'"""
+    return "/".join(f"job/{name}" for name in job_full_name.split("/"))
+
+
 class AugmentedJenkinsClient:
     """Provides typed interface to a JenkinsClient instance"""
 
     def __init__(self, url: str, username: str, password: str, timeout: int | None = None) -> None:
         """Create a Jenkins client interface using the config file used for JJB"""
-        self.client = Jenkins(
+        from jenkins import Jenkins
+        from requests.adapters import HTTPAdapter
+
+        self.client: "Jenkins" = Jenkins(
             url=url,
             username=username,
             password=password,
             timeout=timeout if timeout is not None else 60,
         )
+        # artifacts get downloaded and build infos fetched concurrently, so provide enough
+        # pooled (kept-alive) connections to avoid re-connecting to Jenkins all the time
+        connection_pool = HTTPAdapter(pool_maxsize=32)
+        for prefix in ("http://", "https://"):
+            self.client._session.mount(prefix, connection_pool)
+        # completed builds don't change anymore, so we fetch them only once (see
+        # _remember_build_info())
+        self._completed_builds: dict[tuple[str, int], GenMap] = {}
+        # First API call gives us
+        #   ERROR    │ requests_kerberos.kerberos_ │ handle_other(): Mutual authentication \
+        #   unavailable on 403 response
+        # no clue why. So we drop this message (only) until we know better
+        logging.getLogger("requests_kerberos.kerberos_").addFilter(_no_mutual_auth_error)
 
     def __enter__(self) -> "AugmentedJenkinsClient":
         """Checks connection by validating sync_whoami()"""
         return self._check_connection()
 
     def __exit__(self, *args: object) -> None:
-        pass
+        """Releases pooled (kept-alive) connections"""
+        self.client._session.close()
 
     async def __aenter__(self) -> "AugmentedJenkinsClient":
         """Checks connection by validating sync_whoami()"""
         return self._check_connection()
 
     async def __aexit__(self, *args: object) -> None:
-        pass
+        """Releases pooled (kept-alive) connections"""
+        self.client._session.close()
 
     def _check_connection(self) -> "AugmentedJenkinsClient":
         whoami = (self.sync_whoami())["id"]
@@ -422,15 +541,7 @@ class AugmentedJenkinsClient:
 
     def sync_whoami(self) -> Mapping[str, str]:
         """Synchronous wrapper for whoami"""
-        # First API call gives us
-        #   ERROR    │ requests_kerberos.kerberos_ │ handle_other(): Mutual authentication \
-        #   unavailable on 403 response
-        # no clue why. So we deactivate this level temporarily until we know better
-        level = logging.getLogger("requests_kerberos.kerberos_").level
-        logging.getLogger("requests_kerberos.kerberos_").setLevel(logging.FATAL)
-        whoami = self.client.get_whoami()
-        logging.getLogger("requests_kerberos.kerberos_").setLevel(level)
-        return whoami
+        return self.client.get_whoami()
 
     async def traverse_job_tree(
         self,
@@ -438,6 +549,8 @@ class AugmentedJenkinsClient:
         ignored_pattern: None | Iterable[str] = None,
     ) -> AsyncIterable[tuple[tuple[str, ...], Folder | SimpleJob]]:
         """Conveniently traverse through a Jenkins job structure recursively"""
+        # materialize once, since it's checked for every node (and could be an iterator)
+        ignored = tuple(ignored_pattern or ())
 
         def recursive_traverse(
             jobs: Iterable[dict[str, Any]], parent_path: tuple[str, ...]
@@ -445,15 +558,15 @@ class AugmentedJenkinsClient:
             """recursively visit all @jobs and maintain @parent_path"""
             for raw_job in sorted(
                 jobs,
-                key=lambda j: j["name"].rsplit("_")[-1].replace(".", ""),
+                key=lambda j: j["name"].rpartition("_")[2].replace(".", ""),
             ):
                 node_path = parent_path + (raw_job["name"],)
                 node_name = "/".join(node_path)
-                jtype = raw_job["_class"].rsplit(".", 1)[-1]
-
-                if any(p in node_name for p in ignored_pattern or []):
+                if any(p in node_name for p in ignored):
                     continue
 
+                jtype = raw_job["_class"].rpartition(".")[2]
+
                 if jtype == "Folder":
                     yield node_path, Folder.model_validate(raw_job)
                     yield from recursive_traverse(raw_job.get("jobs", []), node_path)
@@ -487,18 +600,29 @@ class AugmentedJenkinsClient:
         """Returns the buildtime timestamp in seconds"""
         if build_nr is None:
             return None
-        build_info = await self.raw_build_info(job if isinstance(job, str) else job.path, build_nr)
+        if isinstance(job, Job) and (timestamp := job.build_timestamps.get(build_nr)):
+            return timestamp
+        build_info = await self.raw_build_info_tree(
+            job if isinstance(job, str) else job.path, build_nr, "timestamp"
+        )
         return cast(int, build_info["timestamp"]) // 1000
 
     async def change_sets(self, job: str | Job, build_nr: None | int) -> Iterable[Change]:
         """ "Returns the list of change sets of a given build"""
+        from jenkins import JenkinsException
+
         if build_nr is None:
             return []
         try:
             all_change_sets = (
-                await self.raw_build_info(job if isinstance(job, str) else job.path, build_nr)
+                await self.raw_build_info_tree(
+                    job if isinstance(job, str) else job.path,
+                    build_nr,
+                    CHANGE_SETS_TREE,
+                    _known_build_timestamp(job, build_nr),
+                )
             )["changeSets"]
-        except jenkins.JenkinsException as exc:
+        except JenkinsException as exc:
             log().error("Could not fetch change sets: %s", exc)
             return []
 
@@ -526,7 +650,7 @@ class AugmentedJenkinsClient:
             return last_successful.number, None, last_successful.number
 
         first_failing = (
-            (await self.build_info(job_info.path, last_successful.number)).nextBuild
+            await self.next_build_number(job_info, last_successful.number)
             if last_successful
             else None
         )
@@ -534,10 +658,25 @@ class AugmentedJenkinsClient:
         last_build = job_info.lastCompletedBuild
         return (
             last_successful.number if last_successful else None,
-            first_failing.number if first_failing else None,
+            first_failing,
             last_build.number if last_build else None,
         )
 
+    async def next_build_number(self, job: str | Job, build_nr: int) -> None | int:
+        """Returns the number of the build following @build_nr (None if there is none yet).
+        Build infos already fetched via `Job.expand()` are used instead of requesting them"""
+        if isinstance(job, Job) and (build_info := job.build_infos.get(build_nr)):
+            return build_info.nextBuild.number if build_info.nextBuild else None
+        next_build = (
+            await self.raw_build_info_tree(
+                job if isinstance(job, str) else job.path,
+                build_nr,
+                "nextBuild[number]",
+                _known_build_timestamp(job, build_nr),
+            )
+        )["nextBuild"]
+        return cast(int, cast(GenMap, next_build)["number"]) if next_build else None
+
     @asyncify
     def raw_jobs(self) -> GenMap:
         """Async wrapper for get_jobs()"""
@@ -547,7 +686,7 @@ class AugmentedJenkinsClient:
     def raw_job_info(self, job_full_name: str) -> GenMap:
         """Fetches Jenkins job info for @job_full_name"""
         log().debug("fetch job info for %s", job_full_name)
-        return self.client.get_job_info(job_full_name)
+        return self.client.get_info(_job_url_path(job_full_name), query=f"?tree={JOB_TREE}")
 
     async def job_info(self, job_full_name: str | Sequence[str]) -> Job:
         """Fetches Jenkins job info for @job_full_name"""
@@ -557,11 +696,133 @@ class AugmentedJenkinsClient:
             )
         )
 
+    def _build_cache_dir(self, job_full_name: str) -> Path:
+        return (
+            cache_dir()
+            / "jenkins-builds"
+            / quote(self.client.server, safe="")
+            / quote(job_full_name, safe="")
+        )
+
+    def _build_cache_path(self, job_full_name: str, build_number: int) -> Path:
+        return self._build_cache_dir(job_full_name) / f"{build_number}.{BUILD_CACHE_VERSION}.json"
+
+    def _cached_build_info(
+        self, job_full_name: str, build_number: int, timestamp: None | int
+    ) -> None | GenMap:
+        """Returns a completed build's info from memory or from disk, if available.
+        Since build numbers start over for re-created jobs, persisted build infos are only
+        taken if they match the build's start @timestamp (in seconds) known from Jenkins"""
+        if cached := self._completed_builds.get((job_full_name, build_number)):
+            return cached
+        if timestamp is None:
+            return None
+        persisted = load_json(self._build_cache_path(job_full_name, build_number))
+        if isinstance(persisted, dict) and persisted.get("timestamp", 0) // 1000 == timestamp:
+            return cast(GenMap, persisted)
+        return None
+
+    def _remember_build_info(self, job_full_name: str, build_info: GenMap) -> bool:
+        """Keeps infos of completed builds, which don't change anymore. Builds get persisted
+        only if they've got a successor already, since `nextBuild` would be outdated otherwise.
+        Returns whether or not the build info has been written to disk
+        """
+        if not build_info or build_info.get("inProgress"):
+            return False
+        build_number = cast(int, build_info["number"])
+        self._completed_builds[job_full_name, build_number] = build_info
+        if (
+            build_info.get("nextBuild")
+            and not (cache_path := self._build_cache_path(job_full_name, build_number)).exists()
+        ):
+            dump_json(cache_path, build_info)
+            return True
+        return False
+
+    def _prune_build_cache(self, job_full_name: str) -> None:
+        """Removes persisted build infos of @job_full_name requested with an outdated
+        BUILD_TREE and all but the MAX_CACHED_BUILDS_PER_JOB most recent ones"""
+        current = []
+        try:
+            for path in self._build_cache_dir(job_full_name).glob("*.json"):
+                number, _, version = path.stem.partition(".")
+                if version == BUILD_CACHE_VERSION and number.isdigit():
+                    current.append((int(number), path))
+                else:
+                    path.unlink(missing_ok=True)
+            for _, path in sorted(current, reverse=True)[MAX_CACHED_BUILDS_PER_JOB:]:
+                path.unlink(missing_ok=True)
+        except OSError as exc:
+            log().debug("could not prune cached build infos of %s: %s", job_full_name, exc)
+
     @asyncify
     def raw_build_info(self, job_full_name: str, build_number: int) -> GenMap:
-        """Returns raw Jenkins job info for @job_full_name"""
-        log().debug("fetch build log for %s:%d", job_full_name, build_number)
-        return self.client.get_build_info(job_full_name, build_number)
+        """Returns raw Jenkins job info for @job_full_name. Persisted build infos are not
+        taken into account, since @build_number might come from a build we've just
+        triggered"""
+        if cached := self._completed_builds.get((job_full_name, build_number)):
+            return cached
+        log().debug("fetch build info for %s:%d", job_full_name, build_number)
+        build_info = self.client.get_info(
+            f"{_job_url_path(job_full_name)}/{build_number}", query=f"?tree={BUILD_TREE}"
+        )
+        if self._remember_build_info(job_full_name, build_info):
+            self._prune_build_cache(job_full_name)
+        return build_info
+
+    @asyncify
+    def raw_build_info_tree(
+        self, job_full_name: str, build_number: int, tree: str, timestamp: None | int = None
+    ) -> GenMap:
+        """Returns only the @tree filtered part of Jenkins build info for
+        @job_full_name#@build_number, unless the complete info is already at hand (persisted
+        infos need the build's start @timestamp to be known, see _cached_build_info())"""
+        if cached := self._cached_build_info(job_full_name, build_number, timestamp):
+            return cached
+        log().debug("fetch build info (%s) for %s:%d", tree, job_full_name, build_number)
+        return self.client.get_info(
+            f"{_job_url_path(job_full_name)}/{build_number}", query=f"?tree={tree}"
+        )
+
+    @asyncify
+    def raw_build_infos(
+        self, job_full_name: str, max_builds: None | int = None, offset: int = 0
+    ) -> GenMapArray:
+        """Returns raw build infos of the (at most @max_builds) most recent builds of
+        @job_full_name (skipping the first @offset) using only one request"""
+        log().debug("fetch build infos for %s", job_full_name)
+        builds_range = (
+            f"{{{offset},{'' if max_builds is None else offset + max_builds}}}"
+            if offset or max_builds is not None
+            else ""
+        )
+        build_infos = cast(
+            GenMapArray,
+            self.client.get_info(
+                _job_url_path(job_full_name),
+                query=f"?tree=builds[{BUILD_TREE}]{builds_range}",
+            )["builds"],
+        )
+        persisted = False
+        for build_info in build_infos:
+            persisted |= self._remember_build_info(job_full_name, cast(GenMap, build_info))
+        if persisted:
+            self._prune_build_cache(job_full_name)
+        return build_infos
+
+    async def build_infos(
+        self, job_full_name: str | Sequence[str], max_builds: None | int = None, offset: int = 0
+    ) -> Sequence[Build]:
+        """Fetches Jenkins build infos for the (at most @max_builds) most recent builds of
+        @job_full_name (skipping the first @offset)"""
+        return [
+            Build.model_validate(build_info)
+            for build_info in await self.raw_build_infos(
+                job_full_name if isinstance(job_full_name, str) else "/".join(job_full_name),
+                max_builds,
+                offset,
+            )
+        ]
 
     async def build_info(self, job_full_name: str | Sequence[str], build_number: int) -> Build:
         """Fetches Jenkins build info for @job_full_name#@build_number"""
@@ -574,8 +835,13 @@ class AugmentedJenkinsClient:
 
     @asyncify
     def queue_info(self) -> Sequence[GenMap]:
-        """Async wrapper for get_queue_info()"""
-        return self.client.get_queue_info()
+        """Async wrapper for get_queue_info(), restricted to the fields we evaluate"""
+        return cast(
+            Sequence[GenMap],
+            self.client.get_info(
+                "queue", query="?tree=items[id,url,why,task[url],actions[parameters[name,value]]]"
+            )["items"],
+        )
 
     @asyncify
     def build_stages(self, job: str | Sequence[str] | Job, build_number: int) -> BuildStages:
@@ -687,6 +953,7 @@ async def main() -> None:  # pylint: disable=too-many-locals
             }, job_info.color
 
             print(f"{job_info}, url={job_info.url}")
+            await job_info.expand(jenkins_client)
             (
                 last_successful,
                 first_failing,
@@ -700,7 +967,6 @@ async def main() -> None:  # pylint: disable=too-many-locals
                 build_stages = await jenkins_client.build_stages(job_info, first_failing)
                 print(build_stages)
 
-            await job_info.expand(jenkins_client)
             for build_nr, build_info in job_info.build_infos.items():
                 assert build_nr == build_info.number
                 print(f"  {build_info}, url={build_info.url}")
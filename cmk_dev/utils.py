@@ -8,10 +8,16 @@ This file is part of Checkmk (https://checkmk.com). It is subject to the terms a
 conditions defined in the file COPYING, which is part of this source code package.
 """
 
+import hashlib
+import json
 import logging
-from collections.abc import Mapping
-from contextlib import suppress
+import mmap
+import os
+import sys
+from collections.abc import Iterator, Mapping, MutableMapping
+from contextlib import contextmanager, suppress
 from pathlib import Path
+from typing import Any
 
 
 class Fatal(RuntimeError):
@@ -24,13 +30,71 @@ def log() -> logging.Logger:
     return logging.getLogger("trickkiste.cmk-dev.utils")
 
 
-def value_from(raw_str: str) -> str | float | int:
-    """Returns an int, a float or the raw input in this order"""
-    with suppress(ValueError):
-        return int(raw_str)
-    with suppress(ValueError):
-        return float(raw_str)
-    return raw_str
+def md5from(filepath: Path) -> None | str:
+    """Returns the MD5 sum of the contents of @filepath or None if it does not exist.
+    Unlike a chunk-by-chunk loop this keeps the whole hashing inside hashlib
+    >>> md5from(Path("/does/not/exist")) is None
+    True
+    """
+    with suppress(FileNotFoundError):
+        with open(filepath, "rb") as input_file:
+            if sys.version_info >= (3, 11):
+                return hashlib.file_digest(input_file, "md5").hexdigest()
+            # mmap() refuses to map empty files
+            if os.fstat(input_file.fileno()).st_size == 0:
+                return hashlib.md5().hexdigest()
+            with mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                return hashlib.md5(mapped_file).hexdigest()
+    return None
+
+
+def cache_dir() -> Path:
+    """Returns the directory cmk-dev tools keep data in which is expensive to (re)compute"""
+    return Path(os.environ.get("XDG_CACHE_HOME") or "~/.cache").expanduser() / "cmk-dev"
+
+
+def load_json(path: Path) -> Any:
+    """Returns the JSON content stored at @path or None if it can't be read"""
+    with suppress(FileNotFoundError, ValueError):
+        return json.loads(path.read_text())
+    return None
+
+
+def dump_json(path: Path, content: Any) -> None:
+    """Atomically writes @content as JSON to @path. Meant for cache files, so failing to
+    write is not considered an error."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path := path.with_suffix(f".{os.getpid()}.tmp")).write_text(json.dumps(content))
+        tmp_path.replace(path)
+    except OSError as exc:
+        log().debug("could not write %s: %s", path, exc)
+
+
+@contextmanager
+def persistent_json(path: Path) -> Iterator[dict[str, Any]]:
+    """Provides the JSON object stored at @path (or an empty one) and writes it back
+    afterwards. Being a cache, unreadable or unwritable files are not considered an error."""
+    content = load_json(path)
+    if not isinstance(content, dict):
+        content = {}
+    yield content
+    dump_json(path, content)
+
+
+def cached_md5from(filepath: Path, cache: MutableMapping[str, Any]) -> None | str:
+    """Like md5from() but doesn't read @filepath if its modification time and size match
+    the values stored in @cache, which otherwise gets updated"""
+    try:
+        stat = filepath.stat()
+    except FileNotFoundError:
+        return None
+    key = str(filepath.absolute())
+    if (cached := cache.get(key)) and cached[:2] == [stat.st_mtime_ns, stat.st_size]:
+        return str(cached[2])
+    if (file_hash := md5from(filepath)) is not None:
+        cache[key] = [stat.st_mtime_ns, stat.st_size, file_hash]
+    return file_hash
 
 
 def distro_code(distro_name: str) -> str:
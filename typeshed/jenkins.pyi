@@ -3,6 +3,7 @@ from collections.abc import Mapping, Sequence
 from typing import TypeAlias, Union
 
 from requests import Response
+from requests.adapters import BaseAdapter
 
 GenMapVal: TypeAlias = Union[None, bool, str, float, int, "GenMapArray", "GenMap"]
 GenMapArray: TypeAlias = Sequence[GenMapVal]
@@ -13,6 +14,12 @@ class Session:
     def get(self, url: str, stream: bool = False) -> Response:
         ...
 
+    def mount(self, prefix: str, adapter: BaseAdapter) -> None:
+        ...
+
+    def close(self) -> None:
+        ...
+
 
 class Auth:
     username: bytes
@@ -23,6 +30,7 @@ class JenkinsException(BaseException):
 
 
 class Jenkins:
+    server: str
     _session: Session
     auth: Auth
 
@@ -50,6 +58,9 @@ class Jenkins:
     def get_queue_info(self) -> Sequence[GenMap]:
         ...
 
+    def get_info(self, item: str = "", query: None | str = None) -> GenMap:
+        ...
+
     def get_build_stages(self, job_name: str, number: int) -> Sequence[GenMap]:
         ...
 